@@ -1,22 +1,28 @@
 # bot_fun.py
 # A fast and friendly ICS bot with one-liner command parsing and 12-hour time support
-# pip install "python-telegram-bot==21.4" icalendar tzdata
+# pip install "python-telegram-bot[webhooks]==21.4" tzdata
+# (the webhooks extra is only needed when WEBHOOK_URL is set; plain long
+#  polling works without it)
 
-import io
+import asyncio
+import concurrent.futures
+import functools
 import re
 import logging
+import time
 import datetime as dt
 from zoneinfo import ZoneInfo
 
 from telegram import Update, InputFile
 from telegram.ext import Application, CommandHandler, ContextTypes
-from icalendar import Calendar, Event, Alarm
 
 # ===== CONFIG =====
 BOT_TOKEN = "5874721630:AAEX727ifMjn-e8yULU1IrLrp71rm3rr8S0"  # replace before running
 DEFAULT_TZ = "Asia/Kolkata"
 DEFAULT_DURATION_MIN = 60  # when end time is not specified
 MAX_REMINDER_MIN = 10080   # 7 days
+WEBHOOK_URL = ""           # e.g. "https://example.com/bot"; empty = long polling
+WEBHOOK_PORT = 8443
 
 # ===== LOGGING =====
 logging.basicConfig(
@@ -26,24 +32,50 @@ logging.basicConfig(
 log = logging.getLogger("funics")
 
 # ===== PARSING HELPERS =====
+# Precompiled so each /event message skips the regex-compile path
+_RE_AMPM = re.compile(r"(\d{1,2})(?::(\d{2}))?\s*(am|pm)\Z")
+_RE_AMPM_COMPACT = re.compile(r"(\d{1,2})(am|pm)\Z")
+# One alternation covers reminder, location and description so smart_parse
+# extracts all three in a single scan instead of three search-and-rebuild passes
+_RE_EXTRACT = re.compile(
+    r"(?P<rem>\b(?i:r)(?P<rem_min>\d{1,5})\b)"
+    r"|(?P<loc>#(?P<loc_val>[^!@rR]+))"
+    r"|(?P<desc>!(?P<desc_val>.+?)(?=\s+(?i:r)\d{1,5}\s*(?:$|#)|\s*#|$))"
+)
+
 def parse_date(text: str) -> dt.date | None:
     """Accepts YYYY-MM-DD, DD-MM-YYYY, DD-MM, DD/MM/YYYY, DD/MM.
-       If year is missing, uses current year; if date already passed, rolls to next year."""
+       If year is missing, uses current year; if date already passed, rolls to next year.
+       Scans the digits directly instead of probing strptime formats, so a miss
+       costs no exception."""
     text = text.strip()
-    fmts = ("%Y-%m-%d", "%d-%m-%Y", "%d-%m", "%d/%m/%Y", "%d/%m")
-    for fmt in fmts:
-        try:
-            d = dt.datetime.strptime(text, fmt)
-            if fmt in ("%d-%m", "%d/%m"):
-                today = dt.date.today()
-                year = today.year
-                cand = dt.date(year, d.month, d.day)
-                if cand < today:
-                    cand = dt.date(year + 1, d.month, d.day)
-                return cand
-            return d.date()
-        except ValueError:
-            continue
+    sep = "-" if "-" in text else "/"
+    parts = text.split(sep)
+    try:
+        nums = [int(p) for p in parts]
+    except ValueError:
+        return None
+
+    try:
+        if len(nums) == 3:
+            if len(parts[0]) == 4:
+                year, month, day = nums  # YYYY-MM-DD
+            elif len(parts[2]) == 4:
+                day, month, year = nums  # DD-MM-YYYY / DD/MM/YYYY
+            else:
+                # Two-digit years ("26-08-25") are ambiguous; reject so the
+                # bot prompts with the supported formats
+                return None
+            return dt.date(year, month, day)
+        if len(nums) == 2:
+            day, month = nums  # DD-MM / DD/MM
+            today = dt.date.today()
+            cand = dt.date(today.year, month, day)
+            if cand < today:
+                cand = dt.date(today.year + 1, month, day)
+            return cand
+    except ValueError:
+        return None
     return None
 
 def parse_time_12_24(text: str) -> dt.time | None:
@@ -56,7 +88,7 @@ def parse_time_12_24(text: str) -> dt.time | None:
     s = text.strip().lower()
 
     # 12h with am/pm (allow optional space)
-    m = re.fullmatch(r"(\d{1,2})(?::(\d{2}))?\s*(am|pm)", s)
+    m = _RE_AMPM.match(s)
     if m:
         h = int(m.group(1))
         mnt = int(m.group(2) or 0)
@@ -70,7 +102,7 @@ def parse_time_12_24(text: str) -> dt.time | None:
         return dt.time(hour=h, minute=mnt)
 
     # 12h compact like "8pm"
-    m2 = re.fullmatch(r"(\d{1,2})(am|pm)", s)
+    m2 = _RE_AMPM_COMPACT.match(s)
     if m2:
         h = int(m2.group(1))
         ap = m2.group(2)
@@ -82,15 +114,26 @@ def parse_time_12_24(text: str) -> dt.time | None:
             h = 12 if h == 12 else h + 12
         return dt.time(hour=h, minute=0)
 
-    # 24h fallbacks
-    for fmt in ("%H:%M", "%H%M", "%H"):
-        try:
-            t = dt.datetime.strptime(text.strip(), fmt).time()
-            if fmt == "%H":
-                return dt.time(hour=t.hour, minute=0)
-            return t
-        except ValueError:
-            continue
+    # 24h fallbacks: "14:05", "1405", "14" — sliced directly, no strptime
+    if ":" in s:
+        hh, _, mm = s.partition(":")
+        if hh.isdigit() and mm.isdigit() and len(mm) in (1, 2):
+            h, mnt = int(hh), int(mm)
+            if h <= 23 and mnt <= 59:
+                return dt.time(hour=h, minute=mnt)
+        return None
+    if s.isdigit():
+        if len(s) <= 2:
+            h = int(s)
+            if h <= 23:
+                return dt.time(hour=h, minute=0)
+        elif len(s) <= 4:
+            h, mnt = int(s[:2]), int(s[2:])
+            if len(s) == 3 and h > 23:
+                # "830" -> 08:30: greedy two-digit hour first, like %H%M
+                h, mnt = int(s[:1]), int(s[1:])
+            if h <= 23 and mnt <= 59:
+                return dt.time(hour=h, minute=mnt)
     return None
 
 def smart_parse(command_text: str) -> dict:
@@ -110,28 +153,38 @@ def smart_parse(command_text: str) -> dict:
         "description": None,
     }
 
-    text = command_text.strip()
-    if text.startswith("/event"):
-        text = text[len("/event"):].strip()
-
-    # Extract reminder r<mins>
-    m = re.search(r"\br(\d{1,5})\b", text, flags=re.IGNORECASE)
-    if m:
-        mins = int(m.group(1))
-        data["reminder"] = max(0, min(MAX_REMINDER_MIN, mins))
-        text = (text[:m.start()] + " " + text[m.end():]).strip()
-
-    # Extract #location (up to next control token or end)
-    m = re.search(r"#([^!@r]+)", text)
-    if m:
-        data["location"] = m.group(1).strip()
-        text = text.replace(m.group(0), "").strip()
-
-    # Extract !description (till end)
-    m = re.search(r"!(.+)$", text)
-    if m:
-        data["description"] = m.group(1).strip()
-        text = text[:m.start()].strip()
+    text = command_text.strip().removeprefix("/event").strip()
+
+    # Extract reminder r<mins>, #location and !description in one scan;
+    # the first occurrence of each wins, matching the old sequential searches
+    rem = loc = desc = None
+    removed = []
+    for m in _RE_EXTRACT.finditer(text):
+        if m.group("rem") is not None:
+            if rem is None:
+                rem = int(m.group("rem_min"))
+                removed.append(m.span())
+        elif m.group("loc") is not None:
+            if loc is None:
+                loc = m.group("loc_val").strip()
+                removed.append(m.span())
+        elif desc is None:
+            desc = m.group("desc_val").strip()
+            removed.append(m.span())
+
+    if rem is not None:
+        data["reminder"] = max(0, min(MAX_REMINDER_MIN, rem))
+    data["location"] = loc
+    data["description"] = desc
+
+    if removed:
+        pieces = []
+        last = 0
+        for s, e in removed:
+            pieces.append(text[last:s])
+            last = e
+        pieces.append(text[last:])
+        text = " ".join(pieces).strip()
 
     # Split into title and schedule by '@'
     if "@" not in text:
@@ -156,6 +209,11 @@ def smart_parse(command_text: str) -> dict:
         data["needs_more"] = "date"
         return data
 
+    # Keep the parsed object and display form so downstream code
+    # (build_ics, the /event echo) doesn't re-parse the ISO string
+    data["_date_obj"] = date_obj
+    data["date_display"] = date_obj.strftime("%d %b %Y")
+
     # Time range or single time
     if "-" in time_str:
         start_str, end_str = map(str.strip, time_str.split("-", 1))
@@ -179,9 +237,53 @@ def smart_parse(command_text: str) -> dict:
     return data
 
 # ===== ICS BUILDER =====
+_UTC = dt.timezone.utc
+
+# The VCALENDAR wrapper never changes, so serialize it once at import time
+# and only build the VEVENT per request.
+_ICS_HEADER = (
+    b"BEGIN:VCALENDAR\r\n"
+    b"PRODID:-//Fun ICS Bot//Telegram//EN\r\n"
+    b"VERSION:2.0\r\n"
+    b"CALSCALE:GREGORIAN\r\n"
+    b"METHOD:PUBLISH\r\n"
+)
+_ICS_FOOTER = b"END:VCALENDAR\r\n"
+
+@functools.lru_cache(maxsize=64)
+def _get_tz(name: str) -> ZoneInfo:
+    """Cache ZoneInfo objects so tzdata isn't reloaded per event."""
+    return ZoneInfo(name)
+
+def _esc(s: str) -> str:
+    """Escape TEXT values per RFC5545 3.3.11."""
+    return (
+        s.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+def _fold(line: str) -> bytes:
+    """Fold a content line at 75 octets (RFC5545 3.1), keeping UTF-8 sequences intact."""
+    raw = line.encode("utf-8")
+    if len(raw) <= 75:
+        return raw + b"\r\n"
+    out = []
+    while len(raw) > 75:
+        cut = 75
+        while cut > 1 and (raw[cut] & 0xC0) == 0x80:  # don't split inside a codepoint
+            cut -= 1
+        out.append(raw[:cut])
+        raw = b" " + raw[cut:]
+    out.append(raw)
+    return b"\r\n".join(out) + b"\r\n"
+
 def build_ics(data: dict) -> bytes:
-    tz = ZoneInfo(data.get("timezone") or DEFAULT_TZ)
-    date = dt.date.fromisoformat(data["date"])
+    # The tz object only validates the name; the output carries it as TZID
+    tzname = data.get("timezone") or DEFAULT_TZ
+    tz = _get_tz(tzname)
+    date = data.get("_date_obj") or dt.date.fromisoformat(data["date"])
     sh, sm = map(int, data["start_time"].split(":"))
     dtstart = dt.datetime(date.year, date.month, date.day, sh, sm, tzinfo=tz)
 
@@ -194,36 +296,46 @@ def build_ics(data: dict) -> bytes:
     if dtend <= dtstart:
         dtend = dtstart + dt.timedelta(minutes=DEFAULT_DURATION_MIN)
 
-    cal = Calendar()
-    cal.add("prodid", "-//Fun ICS Bot//Telegram//EN")
-    cal.add("version", "2.0")
-    cal.add("calscale", "GREGORIAN")
-    cal.add("method", "PUBLISH")
+    now_utc = dt.datetime.now(_UTC)
+    # Nanosecond resolution keeps UIDs unique across rapid /event bursts;
+    # the old int(timestamp()) collided for two events in the same second.
+    uid = f"{time.time_ns()}@fun-ics"
 
-    event = Event()
-    event.add("uid", f"{int(dt.datetime.now(dt.timezone.utc).timestamp())}@fun-ics")
-    event.add("dtstamp", dt.datetime.now(dt.timezone.utc))
-    event.add("summary", data["title"])
-    event.add("dtstart", dtstart)
-    event.add("dtend", dtend)
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{now_utc:%Y%m%dT%H%M%S}Z",
+        f"SUMMARY:{_esc(data['title'])}",
+        f"DTSTART;TZID={tzname}:{dtstart:%Y%m%dT%H%M%S}",
+        f"DTEND;TZID={tzname}:{dtend:%Y%m%dT%H%M%S}",
+    ]
 
     if data.get("location"):
-        event.add("location", data["location"])
+        lines.append(f"LOCATION:{_esc(data['location'])}")
     if data.get("description"):
-        event.add("description", data["description"])
+        lines.append(f"DESCRIPTION:{_esc(data['description'])}")
 
     reminder = data.get("reminder") or 0
     if isinstance(reminder, int) and reminder > 0:
-        alarm = Alarm()
-        alarm.add("action", "DISPLAY")
-        alarm.add("description", f"Reminder: {data['title']}")
-        alarm.add("trigger", dt.timedelta(minutes=-reminder))  # minutes before start
-        event.add_component(alarm)
+        lines += [
+            "BEGIN:VALARM",
+            "ACTION:DISPLAY",
+            f"DESCRIPTION:{_esc('Reminder: ' + data['title'])}",
+            f"TRIGGER:-PT{reminder}M",  # minutes before start
+            "END:VALARM",
+        ]
 
-    cal.add_component(event)
-    return cal.to_ical()
+    lines.append("END:VEVENT")
+    return _ICS_HEADER + b"".join(_fold(line) for line in lines) + _ICS_FOOTER
 
 # ===== COMMAND HANDLERS =====
+# Fixed-size pool for ICS builds: stable workers, predictable tail latency
+# under bursts, no reliance on the default executor's sizing
+ICS_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="ics-")
+
+# Maps spaces and filesystem-unsafe characters in one translate pass
+_FILENAME_TRANS = str.maketrans({" ": "_", "/": "_", "\\": "_", ":": "_", "\n": "_"})
+
 HELP_TEXT = (
     "Create and share events quickly:\n\n"
     "Syntax:\n"
@@ -236,6 +348,8 @@ HELP_TEXT = (
     "- /event Dinner @ 2025-08-26 8 PM #Jubilee Hills\n"
     "- /event Quick Call @ 26/08 2:30 pm\n"
 )
+# Encoded once at import time for any raw HTTP send path
+_HELP_BYTES = HELP_TEXT.encode("utf-8")
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(
@@ -245,7 +359,8 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
 async def help_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    await update.message.reply_text(HELP_TEXT)
+    # parse_mode=None skips PTB's Markdown/HTML entity parsing for this constant
+    await update.message.reply_text(HELP_TEXT, parse_mode=None)
 
 async def event_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     text = update.message.text or ""
@@ -280,46 +395,70 @@ async def event_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 await update.message.reply_text("Please provide title, date, and time.")
             return
 
-        # Build ICS
-        ics_bytes = build_ics(data)
-        filename = f"{data['title'].strip().replace(' ', '_')}.ics"
-        bio = io.BytesIO(ics_bytes)
-        bio.name = filename
+        # Build ICS off the event loop; build_ics is pure CPU with no shared
+        # state, so other updates keep flowing while it runs.
+        loop = asyncio.get_running_loop()
+        ics_future = loop.run_in_executor(ICS_POOL, build_ics, data)
+        filename = data["title"].strip().translate(_FILENAME_TRANS) + ".ics"
 
         # Friendly echo of what was parsed
-        date_disp = dt.date.fromisoformat(data["date"]).strftime("%d %b %Y")
+        date_disp = data["date_display"]
         start_disp = data["start_time"]
         end_disp = data["end_time"] or f"+{DEFAULT_DURATION_MIN}m"
         tz_disp = data.get("timezone", DEFAULT_TZ)
         loc_disp = data.get("location") or "-"
         rem_disp = data.get("reminder") or 0
 
-        msg = (
+        # One captioned document instead of summary + document: each /event
+        # costs a single slot of the 30-msg/sec bot-wide quota.
+        caption = (
             f"Event ready ✅\n"
             f"- Title: {data['title']}\n"
             f"- When: {date_disp} {start_disp}–{end_disp}\n"
             f"- TZ: {tz_disp}\n"
             f"- Location: {loc_disp}\n"
             f"- Reminder: {rem_disp} min\n\n"
-            f"Sending .ics…"
-        )
-        await update.message.reply_text(msg)
-        await update.message.reply_document(InputFile(bio, filename=filename), caption="Share this .ics via WhatsApp or email.")
+            f"Share this .ics via WhatsApp or email."
+        )[:1024]  # Telegram caption limit
+        ics_bytes = await ics_future
+        await update.message.reply_document(InputFile(ics_bytes, filename=filename), caption=caption)
     except Exception as e:
         log.exception("Failed to process /event")
         await update.message.reply_text("Sorry, something went wrong creating your event. Check syntax with /help and try again.")
 
 # ===== APP =====
+async def _shutdown_ics_pool(app: Application) -> None:
+    ICS_POOL.shutdown(wait=False)
+
 def main():
     if not BOT_TOKEN or BOT_TOKEN == "YOUR_BOT_TOKEN_HERE":
         raise RuntimeError("Set BOT_TOKEN first")
 
-    app = Application.builder().token(BOT_TOKEN).build()
+    # concurrent_updates lets PTB dispatch handlers in parallel instead of
+    # serializing every update behind the slowest one
+    app = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        .concurrent_updates(True)
+        .post_shutdown(_shutdown_ics_pool)
+        .build()
+    )
     app.add_handler(CommandHandler("start", start))
     app.add_handler(CommandHandler("help", help_cmd))
     app.add_handler(CommandHandler("event", event_cmd))
     print("Fun ICS bot running. Try /event Title @ 25-08 10:00 AM-11:00 AM #Place r15")
-    app.run_polling(allowed_updates=["message"])
+    if WEBHOOK_URL:
+        # Webhook mode: Telegram pushes updates in batches instead of us
+        # long-polling one at a time
+        app.run_webhook(
+            listen="0.0.0.0",
+            port=WEBHOOK_PORT,
+            url_path=BOT_TOKEN,
+            webhook_url=f"{WEBHOOK_URL.rstrip('/')}/{BOT_TOKEN}",
+            allowed_updates=["message"],
+        )
+    else:
+        app.run_polling(allowed_updates=["message"])
 
 if __name__ == "__main__":
     main()
@@ -1,18 +1,21 @@
 import os
+import asyncio
 import logging
-from datetime import datetime, timedelta
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 from telegram import Update
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
+from telegram.ext import AIORateLimiter, Application, MessageHandler, filters, ContextTypes
 from google import genai
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
-import pickle
+from google_auth_httplib2 import AuthorizedHttp
+import httplib2
 import re
-from dateutil import parser as date_parser
-from dateutil.relativedelta import relativedelta
 
 # Load environment variables
 load_dotenv()
@@ -27,120 +30,236 @@ logger = logging.getLogger(__name__)
 # Google Calendar API scopes
 SCOPES = ['https://www.googleapis.com/auth/calendar']
 
+# How long cached event listings stay fresh (seconds)
+EVENTS_CACHE_TTL = 30
+
+# Shared fetch horizon: /events (30 days) and reminders (60 days) are both
+# served from one cached fetch of this size
+EVENTS_WINDOW_DAYS = 60
+
+# How often the background task checks whether the OAuth token needs a refresh
+TOKEN_REFRESH_INTERVAL = 50 * 60  # seconds
+
+# Precompiled patterns for natural-language parsing (compiled once, not per message)
+TIME_STRIP_RE = re.compile(r'\d{1,2}:?\d{0,2}\s*(am|pm)', re.IGNORECASE)
+NUM_RE = re.compile(r'\b\d{1,2}\b')
+
+# One alternation covers every date/time token parse_datetime cares about,
+# so a single finditer pass replaces the per-keyword substring checks
+DATE_RE = re.compile(
+    r'(?P<today>\btoday\b)'
+    r'|(?P<tomorrow>\btomorrow\b)'
+    r'|(?P<next>\bnext\b)'
+    r'|(?P<weekday>\b(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b)'
+    r'|(?P<hour>\d{1,2}):?(?P<min>\d{2})?\s*(?P<mer>am|pm)'
+    r'|(?P<day>\b\d{1,2})(?:st|nd|rd|th)?\b'
+)
+STOPWORDS_RE = re.compile(
+    r'\b(?:today|tomorrow|on|at|the|next|'
+    r'monday|tuesday|wednesday|thursday|friday|saturday|sunday|'
+    r'st|nd|rd|th)\b',
+    re.IGNORECASE
+)
+
+WEEKDAY_MAP = {
+    'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
+    'friday': 4, 'saturday': 5, 'sunday': 6
+}
+
+def _title_matches(keywords_lower, title_lower):
+    """True if any keyword occurs in the title (early-exit substring scan)"""
+    return any(kw in title_lower for kw in keywords_lower)
+
 class CalendarBot:
     def __init__(self):
         self.service = None
-        # Initialize Gemini client for /ask only
-        try:
-            self.client = genai.Client(api_key=os.getenv('GEMINI_API_KEY'))
-        except:
-            self.client = None
-        
+        self._creds = None
+        # Per-thread httplib2 transports: the service's default http is not
+        # thread-safe, and to_thread workers run concurrently
+        self._local = threading.local()
+        # Single-flight lock so concurrent requests don't all trigger a refresh
+        self._refresh_lock = threading.Lock()
+        # Short-TTL cache of events().list results, keyed by the days window:
+        # {days: (monotonic_timestamp, items)}
+        self._events_cache = {}
+        # Gemini client for /ask, created lazily on first use
+        self.client = None
+
+    def _get_gemini(self):
+        """Create the Gemini client on first /ask; other users never pay for it"""
+        if self.client is None:
+            try:
+                self.client = genai.Client(api_key=os.getenv('GEMINI_API_KEY'))
+            except Exception as e:
+                logger.error(f"Error initializing Gemini client: {e}")
+        return self.client
+
+    def _save_token(self, creds):
+        """Persist credentials atomically so a crash can't corrupt the token file"""
+        tmp = 'token.json.tmp'
+        with open(tmp, 'w') as token:
+            token.write(creds.to_json())
+        os.replace(tmp, 'token.json')
+
     def get_calendar_service(self):
         """Authenticate and return Google Calendar service"""
         if self.service:
             return self.service
-            
-        creds = None
-        
-        if os.path.exists('token.pickle'):
-            with open('token.pickle', 'rb') as token:
-                creds = pickle.load(token)
-        
+
+        # In-memory credentials make repeat auth checks O(1); the JSON token
+        # file is only read once per process and is both faster and safer to
+        # load than the old pickle
+        creds = self._creds
+
+        if creds is None and os.path.exists('token.json'):
+            creds = Credentials.from_authorized_user_file('token.json', SCOPES)
+
         if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                if not os.path.exists('credentials.json'):
-                    raise FileNotFoundError(
-                        "credentials.json not found! Please download it from Google Cloud Console."
-                    )
-                flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
-                creds = flow.run_local_server(port=0)
-            
-            with open('token.pickle', 'wb') as token:
-                pickle.dump(creds, token)
-        
-        self.service = build('calendar', 'v3', credentials=creds)
+            with self._refresh_lock:
+                if creds and creds.expired and creds.refresh_token:
+                    creds.refresh(Request())
+                else:
+                    if not os.path.exists('credentials.json'):
+                        raise FileNotFoundError(
+                            "credentials.json not found! Please download it from Google Cloud Console."
+                        )
+                    flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
+                    creds = flow.run_local_server(port=0)
+
+                self._save_token(creds)
+
+        self._creds = creds
+
+        # static_discovery uses the discovery doc bundled with the client
+        # library: no HTTPS fetch on cold start, no file_cache warning
+        self.service = build('calendar', 'v3', credentials=creds,
+                             static_discovery=True, cache_discovery=False)
         return self.service
-    
+
+    def _thread_http(self):
+        """Return this thread's own AuthorizedHttp transport.
+
+        httplib2 connections are not thread-safe, so two concurrent commands
+        sharing the service's default transport could interleave reads on one
+        TLS connection. Every request therefore executes over a per-thread
+        transport via execute(http=...).
+        """
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = AuthorizedHttp(self._creds, http=httplib2.Http())
+            self._local.http = http
+        return http
+
+    def refresh_credentials_if_needed(self):
+        """Refresh the OAuth token off the hot path when it is close to expiry.
+
+        Called periodically from a background task so ordinary requests never
+        pay the 401 -> refresh -> retry latency spike. The lock serializes
+        refreshes across threads (single-flight).
+        """
+        with self._refresh_lock:
+            creds = self._creds
+            if not creds or not creds.refresh_token:
+                return
+            if creds.expiry and creds.expiry - datetime.utcnow() > timedelta(minutes=10):
+                return
+            try:
+                creds.refresh(Request())
+                self._save_token(creds)
+                logger.info("Proactively refreshed Google OAuth token")
+            except Exception as e:
+                logger.error(f"Background token refresh failed: {e}")
+
+    @contextmanager
+    def batch(self):
+        """Queue several calendar writes and send them as one HTTP batch.
+
+        Usage (from sync code or a worker thread):
+            with bot.batch() as b:
+                bot._add_event_sync(..., batch=b)
+                bot._delete_event_sync(..., batch=b)
+        """
+        service = self.get_calendar_service()
+        batch = service.new_batch_http_request()
+        yield batch
+        batch.execute(http=self._thread_http())
+        self._events_cache.clear()
+
     def parse_datetime(self, text):
-        """Parse datetime from natural language text"""
+        """Parse datetime from natural language text in a single regex pass"""
         text = text.lower().strip()
         now = datetime.now()
-        
-        # Extract time if present
-        time_match = re.search(r'(\d{1,2}):?(\d{2})?\s*(am|pm)', text)
+
         event_time = None
-        
-        if time_match:
-            hour = int(time_match.group(1))
-            minute = int(time_match.group(2)) if time_match.group(2) else 0
-            meridiem = time_match.group(3)
-            
-            if meridiem == 'pm' and hour != 12:
-                hour += 12
-            elif meridiem == 'am' and hour == 12:
-                hour = 0
-                
-            event_time = f"{hour:02d}:{minute:02d}"
-        
-        # Parse date
+        has_today = has_tomorrow = has_next = False
+        weekday = None
+        day_num = None
+
+        # One traversal collects every token; first occurrence of each wins
+        for m in DATE_RE.finditer(text):
+            if m.group('mer'):
+                if event_time is None:
+                    hour = int(m.group('hour'))
+                    minute = int(m.group('min')) if m.group('min') else 0
+                    meridiem = m.group('mer')
+
+                    if meridiem == 'pm' and hour != 12:
+                        hour += 12
+                    elif meridiem == 'am' and hour == 12:
+                        hour = 0
+
+                    event_time = f"{hour:02d}:{minute:02d}"
+            elif m.group('today'):
+                has_today = True
+            elif m.group('tomorrow'):
+                has_tomorrow = True
+            elif m.group('next'):
+                has_next = True
+            elif m.group('weekday'):
+                if weekday is None:
+                    weekday = WEEKDAY_MAP[m.group('weekday')]
+            elif day_num is None:
+                day_num = int(m.group('day'))
+
+        # Resolve the date with the same priority as the old branch chain
         event_date = None
-        
-        # Check for "today"
-        if 'today' in text:
+
+        if has_today:
             event_date = now.date()
-        
-        # Check for "tomorrow"
-        elif 'tomorrow' in text:
+        elif has_tomorrow:
             event_date = (now + timedelta(days=1)).date()
-        
-        # Check for day of week
-        elif any(day in text for day in ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']):
-            days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-            for i, day in enumerate(days):
-                if day in text:
-                    target_weekday = i
-                    current_weekday = now.weekday()
-                    days_ahead = target_weekday - current_weekday
-                    
-                    if days_ahead <= 0:
-                        days_ahead += 7
-                    
-                    if 'next' in text and days_ahead < 7:
-                        days_ahead += 7
-                    
-                    event_date = (now + timedelta(days=days_ahead)).date()
-                    break
-        
-        # Check for specific date patterns like "15th", "on the 15th", "15"
-        else:
-            day_match = re.search(r'\b(\d{1,2})(st|nd|rd|th)?\b', text)
-            if day_match:
-                day = int(day_match.group(1))
-                if 1 <= day <= 31:
-                    # Assume current month or next month if day has passed
-                    try:
-                        event_date = datetime(now.year, now.month, day).date()
-                        if event_date < now.date():
-                            # Try next month
-                            next_month = now.month + 1 if now.month < 12 else 1
-                            next_year = now.year if now.month < 12 else now.year + 1
-                            event_date = datetime(next_year, next_month, day).date()
-                    except ValueError:
-                        # Invalid day for month, try next month
-                        next_month = now.month + 1 if now.month < 12 else 1
-                        next_year = now.year if now.month < 12 else now.year + 1
-                        try:
-                            event_date = datetime(next_year, next_month, day).date()
-                        except ValueError:
-                            event_date = None
-        
+        elif weekday is not None:
+            days_ahead = weekday - now.weekday()
+
+            if days_ahead <= 0:
+                days_ahead += 7
+
+            if has_next and days_ahead < 7:
+                days_ahead += 7
+
+            event_date = (now + timedelta(days=days_ahead)).date()
+        elif day_num is not None and 1 <= day_num <= 31:
+            # Assume current month or next month if day has passed
+            try:
+                event_date = datetime(now.year, now.month, day_num).date()
+                if event_date < now.date():
+                    # Try next month
+                    next_month = now.month + 1 if now.month < 12 else 1
+                    next_year = now.year if now.month < 12 else now.year + 1
+                    event_date = datetime(next_year, next_month, day_num).date()
+            except ValueError:
+                # Invalid day for month, try next month
+                next_month = now.month + 1 if now.month < 12 else 1
+                next_year = now.year if now.month < 12 else now.year + 1
+                try:
+                    event_date = datetime(next_year, next_month, day_num).date()
+                except ValueError:
+                    event_date = None
+
         # If no date found, default to today
         if event_date is None:
             event_date = now.date()
-        
+
         return event_date, event_time
     
     def extract_title(self, text):
@@ -149,29 +268,29 @@ class CalendarBot:
         title = text
         
         # Remove time patterns
-        title = re.sub(r'\d{1,2}:?\d{0,2}\s*(am|pm)', '', title, flags=re.IGNORECASE)
-        
-        # Remove date keywords
-        keywords = ['today', 'tomorrow', 'on', 'at', 'the', 'next', 
-                   'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday',
-                   'st', 'nd', 'rd', 'th']
-        
-        for keyword in keywords:
-            title = re.sub(r'\b' + keyword + r'\b', '', title, flags=re.IGNORECASE)
-        
+        title = TIME_STRIP_RE.sub('', title)
+
+        # Remove date keywords in one alternation pass
+        title = STOPWORDS_RE.sub('', title)
+
         # Remove day numbers
-        title = re.sub(r'\b\d{1,2}\b', '', title)
+        title = NUM_RE.sub('', title)
         
         # Clean up extra spaces
         title = ' '.join(title.split())
         
         return title.strip() or "Event"
     
-    def add_event(self, title, event_date, event_time, duration_hours=1):
-        """Add event to Google Calendar"""
+    async def add_event(self, title, event_date, event_time, duration_hours=1, batch=None):
+        """Add event to Google Calendar without blocking the event loop"""
+        return await asyncio.to_thread(
+            self._add_event_sync, title, event_date, event_time, duration_hours, batch
+        )
+
+    def _add_event_sync(self, title, event_date, event_time, duration_hours=1, batch=None):
         try:
             service = self.get_calendar_service()
-            
+
             event = {'summary': title}
             
             if event_time:
@@ -184,59 +303,127 @@ class CalendarBot:
                 event['start'] = {'date': event_date.isoformat()}
                 event['end'] = {'date': event_date.isoformat()}
             
-            result = service.events().insert(calendarId='primary', body=event).execute()
+            request = service.events().insert(calendarId='primary', body=event)
+            if batch is not None:
+                batch.add(request)
+                return None
+            result = request.execute(http=self._thread_http())
+            self._events_cache.clear()
             return result
         except Exception as e:
             logger.error(f"Error adding event: {e}")
             raise
     
-    def get_upcoming_events(self, days=30):
-        """Get upcoming events for the next N days"""
+    async def get_upcoming_events(self, days=30):
+        """Get upcoming events for the next N days (cached for a short TTL)"""
+        return await asyncio.to_thread(self._get_upcoming_events_sync, days)
+
+    def _get_upcoming_events_sync(self, days=30):
         try:
+            cached = self._events_cache.get(days)
+            if cached and time.monotonic() - cached[0] < EVENTS_CACHE_TTL:
+                return cached[1]
+
             service = self.get_calendar_service()
-            
-            now = datetime.utcnow().isoformat() + 'Z'
-            end = (datetime.utcnow() + timedelta(days=days)).isoformat() + 'Z'
-            
+
+            now = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+            end = (datetime.now(timezone.utc) + timedelta(days=days)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
             events_result = service.events().list(
                 calendarId='primary',
                 timeMin=now,
                 timeMax=end,
                 maxResults=50,
                 singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            return events_result.get('items', [])
+                orderBy='startTime',
+                fields='items(id,summary,start,end),nextPageToken'
+            ).execute(http=self._thread_http())
+
+            items = events_result.get('items', [])
+            # Precompute what every scan over the cache needs, once per fetch
+            # instead of once per event per search
+            for ev in items:
+                summary = ev.get('summary', '')
+                ev['_summary_lower'] = summary.lower()
+                ev['_is_reminder'] = summary.startswith('🔔')
+                start = ev['start'].get('dateTime', ev['start'].get('date'))
+                if 'T' in start:
+                    start_dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
+                    ev['_display'] = start_dt.strftime('%B %d at %I:%M %p')
+                else:
+                    start_dt = datetime.strptime(start, '%Y-%m-%d')
+                    ev['_display'] = start_dt.strftime('%B %d') + " (All day)"
+                ev['_start_date'] = start_dt.date()
+            self._events_cache[days] = (time.monotonic(), items)
+            return items
         except Exception as e:
             logger.error(f"Error getting events: {e}")
             raise
     
-    def find_event_by_keywords(self, keywords):
+    async def search_events(self, keywords, days=365):
+        """Search events server-side via the Calendar API's full-text q= filter"""
+        return await asyncio.to_thread(self._search_events_sync, keywords, days)
+
+    def _search_events_sync(self, keywords, days=365):
+        try:
+            service = self.get_calendar_service()
+
+            now = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+            end = (datetime.now(timezone.utc) + timedelta(days=days)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+            events_result = service.events().list(
+                calendarId='primary',
+                q=' '.join(keywords),
+                timeMin=now,
+                timeMax=end,
+                maxResults=10,
+                singleEvents=True,
+                orderBy='startTime',
+                fields='items(id,summary,start,end)'
+            ).execute(http=self._thread_http())
+
+            return events_result.get('items', [])
+        except Exception as e:
+            logger.error(f"Error searching events: {e}")
+            raise
+
+    async def find_event_by_keywords(self, keywords):
         """Find event matching keywords"""
         try:
-            events = self.get_upcoming_events(days=365)
-            
+            # Server-side search first: a handful of candidates on the wire
+            # instead of a year of events filtered in Python
+            for event in await self.search_events(keywords):
+                if not event.get('summary', '').startswith('🔔'):
+                    return event
+
+            # q= matches whole words only; fall back to the forgiving
+            # substring scan over the (cached) listing
+            events = await self.get_upcoming_events(days=365)
+
             keywords_lower = [k.lower() for k in keywords]
-            
+
             for event in events:
-                if event['summary'].startswith('🔔'):
+                if event['_is_reminder']:
                     continue
-                title = event.get('summary', '').lower()
-                if any(kw in title for kw in keywords_lower):
+                if _title_matches(keywords_lower, event['_summary_lower']):
                     return event
-            
+
             return None
         except Exception as e:
             logger.error(f"Error finding event: {e}")
             raise
     
-    def update_event(self, event_id, title, event_date, event_time, duration_hours=1):
-        """Update an existing event"""
+    async def update_event(self, event_id, title, event_date, event_time, duration_hours=1, batch=None):
+        """Update an existing event without blocking the event loop"""
+        return await asyncio.to_thread(
+            self._update_event_sync, event_id, title, event_date, event_time, duration_hours, batch
+        )
+
+    def _update_event_sync(self, event_id, title, event_date, event_time, duration_hours=1, batch=None):
         try:
             service = self.get_calendar_service()
             
-            event = service.events().get(calendarId='primary', eventId=event_id).execute()
+            event = service.events().get(calendarId='primary', eventId=event_id).execute(http=self._thread_http())
             
             event['summary'] = title
             
@@ -250,23 +437,41 @@ class CalendarBot:
                 event['start'] = {'date': event_date.isoformat()}
                 event['end'] = {'date': event_date.isoformat()}
             
-            result = service.events().update(calendarId='primary', eventId=event_id, body=event).execute()
+            request = service.events().update(calendarId='primary', eventId=event_id, body=event)
+            if batch is not None:
+                batch.add(request)
+                return None
+            result = request.execute(http=self._thread_http())
+            self._events_cache.clear()
             return result
         except Exception as e:
             logger.error(f"Error updating event: {e}")
             raise
     
-    def delete_event(self, event_id):
-        """Delete an event"""
+    async def delete_event(self, event_id, batch=None):
+        """Delete an event without blocking the event loop"""
+        return await asyncio.to_thread(self._delete_event_sync, event_id, batch)
+
+    def _delete_event_sync(self, event_id, batch=None):
         try:
             service = self.get_calendar_service()
-            service.events().delete(calendarId='primary', eventId=event_id).execute()
+            request = service.events().delete(calendarId='primary', eventId=event_id)
+            if batch is not None:
+                batch.add(request)
+                return
+            request.execute(http=self._thread_http())
+            self._events_cache.clear()
         except Exception as e:
             logger.error(f"Error deleting event: {e}")
             raise
     
-    def add_reminder(self, title, event_date, event_time):
-        """Add a reminder as a calendar event"""
+    async def add_reminder(self, title, event_date, event_time, batch=None):
+        """Add a reminder as a calendar event without blocking the event loop"""
+        return await asyncio.to_thread(
+            self._add_reminder_sync, title, event_date, event_time, batch
+        )
+
+    def _add_reminder_sync(self, title, event_date, event_time, batch=None):
         try:
             service = self.get_calendar_service()
             
@@ -291,41 +496,59 @@ class CalendarBot:
                 }
             }
             
-            result = service.events().insert(calendarId='primary', body=event).execute()
+            request = service.events().insert(calendarId='primary', body=event)
+            if batch is not None:
+                batch.add(request)
+                return None
+            result = request.execute(http=self._thread_http())
+            self._events_cache.clear()
             return result
         except Exception as e:
             logger.error(f"Error adding reminder: {e}")
             raise
     
-    def get_reminders(self):
+    async def _fetch_window(self, days=EVENTS_WINDOW_DAYS):
+        """Fetch events for any horizon, widening short ones to the shared window.
+
+        Requests for 30 or 60 days hit the same cached 60-day fetch; callers
+        truncate locally. Longer horizons fetch as asked.
+        """
+        return await self.get_upcoming_events(days=max(days, EVENTS_WINDOW_DAYS))
+
+    async def get_reminders(self):
         """Get all upcoming reminders"""
-        events = self.get_upcoming_events(days=60)
-        return [e for e in events if e.get('summary', '').startswith('🔔')]
+        events = await self._fetch_window(days=60)
+        return [e for e in events if e['_is_reminder']]
     
-    def find_reminder_by_keywords(self, keywords):
+    async def find_reminder_by_keywords(self, keywords):
         """Find reminder matching keywords"""
         try:
-            reminders = self.get_reminders()
-            
+            # Server-side search first, keeping only reminder events
+            for event in await self.search_events(keywords, days=60):
+                if event.get('summary', '').startswith('🔔'):
+                    return event
+
+            reminders = await self.get_reminders()
+
             keywords_lower = [k.lower() for k in keywords]
-            
+
             for reminder in reminders:
-                title = reminder.get('summary', '').lower()
-                if any(kw in title for kw in keywords_lower):
+                if _title_matches(keywords_lower, reminder['_summary_lower']):
                     return reminder
-            
+
             return None
         except Exception as e:
             logger.error(f"Error finding reminder: {e}")
             raise
     
-    def ask_question(self, question):
-        """Ask Gemini a general question"""
+    async def ask_question(self, question):
+        """Ask Gemini a general question via its async client"""
         try:
-            if not self.client:
+            client = self._get_gemini()
+            if not client:
                 return "Gemini API is not configured. Please add GEMINI_API_KEY to your .env file."
-            
-            response = self.client.models.generate_content(
+
+            response = await client.aio.models.generate_content(
                 model='gemini-2.0-flash-exp',
                 contents=question
             )
@@ -382,9 +605,12 @@ async def hi_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def account_info(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show connected Google account info"""
-    try:
+    def _fetch_calendar():
         service = bot.get_calendar_service()
-        calendar = service.calendarList().get(calendarId='primary').execute()
+        return service.calendarList().get(calendarId='primary', fields='summary,id,timeZone').execute(http=bot._thread_http())
+
+    try:
+        calendar = await asyncio.to_thread(_fetch_calendar)
         
         info = f"""✅ **Connected Account:**
         
@@ -413,7 +639,7 @@ async def add_event_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         event_date, event_time = bot.parse_datetime(user_message)
         title = bot.extract_title(user_message)
         
-        result = bot.add_event(title, event_date, event_time)
+        result = await bot.add_event(title, event_date, event_time)
         
         if event_time:
             dt = datetime.combine(event_date, datetime.strptime(event_time, '%H:%M').time())
@@ -449,7 +675,7 @@ async def edit_event_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
             await update.message.reply_text("❌ Please specify which event to edit.")
             return
         
-        event = bot.find_event_by_keywords(keywords)
+        event = await bot.find_event_by_keywords(keywords)
         if not event:
             await update.message.reply_text(
                 f"❌ Couldn't find an event matching your description.\n\n"
@@ -464,7 +690,7 @@ async def edit_event_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         if title.lower() == "event":
             title = event['summary']
         
-        bot.update_event(event['id'], title, event_date, event_time)
+        await bot.update_event(event['id'], title, event_date, event_time)
         
         if event_time:
             dt = datetime.combine(event_date, datetime.strptime(event_time, '%H:%M').time())
@@ -493,7 +719,7 @@ async def delete_event_command(update: Update, context: ContextTypes.DEFAULT_TYP
     keywords = user_message.split()
     
     try:
-        event = bot.find_event_by_keywords(keywords)
+        event = await bot.find_event_by_keywords(keywords)
         if not event:
             await update.message.reply_text(
                 f"❌ Couldn't find an event matching: {user_message}\n\n"
@@ -501,7 +727,7 @@ async def delete_event_command(update: Update, context: ContextTypes.DEFAULT_TYP
             )
             return
         
-        bot.delete_event(event['id'])
+        await bot.delete_event(event['id'])
         await update.message.reply_text(f"✅ Deleted event: **{event['summary']}**")
         
     except Exception as e:
@@ -510,28 +736,28 @@ async def delete_event_command(update: Update, context: ContextTypes.DEFAULT_TYP
 async def events_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show upcoming events for next 30 days"""
     try:
-        events = bot.get_upcoming_events(days=30)
-        
-        # Filter out reminders
-        events = [e for e in events if not e['summary'].startswith('🔔')]
-        
-        if not events:
+        # One cached 60-day fetch serves both /events and the reminder
+        # commands; truncate to the 30-day horizon locally
+        events = await bot._fetch_window(days=30)
+        cutoff = (datetime.utcnow() + timedelta(days=30)).date()
+
+        upcoming = []
+        for event in events:
+            if event['_is_reminder']:
+                continue
+            if event['_start_date'] > cutoff:
+                continue
+            upcoming.append((event['summary'], event['_display']))
+
+        if not upcoming:
             await update.message.reply_text("📭 No upcoming events in the next 30 days.")
             return
-        
-        response = "📅 **Your Upcoming Events (Next 30 Days):**\n\n"
-        for event in events:
-            start = event['start'].get('dateTime', event['start'].get('date'))
-            title = event['summary']
-            
-            if 'T' in start:
-                dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
-                response += f"• **{title}**\n  📅 {dt.strftime('%B %d at %I:%M %p')}\n\n"
-            else:
-                dt = datetime.strptime(start, '%Y-%m-%d')
-                response += f"• **{title}**\n  📅 {dt.strftime('%B %d')} (All day)\n\n"
-        
-        await update.message.reply_text(response)
+
+        parts = ["📅 **Your Upcoming Events (Next 30 Days):**\n\n"]
+        for title, display in upcoming:
+            parts.append(f"• **{title}**\n  📅 {display}\n\n")
+
+        await update.message.reply_text(''.join(parts))
         
     except Exception as e:
         await update.message.reply_text(f"❌ Error getting events: {str(e)}")
@@ -559,7 +785,7 @@ async def remind_me_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
         title = bot.extract_title(user_message)
         
-        result = bot.add_reminder(title, event_date, event_time)
+        result = await bot.add_reminder(title, event_date, event_time)
         dt = datetime.combine(event_date, datetime.strptime(event_time, '%H:%M').time())
         
         await update.message.reply_text(
@@ -575,20 +801,18 @@ async def remind_me_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def list_reminders_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /listreminders command"""
     try:
-        reminders = bot.get_reminders()
+        reminders = await bot.get_reminders()
         
         if not reminders:
             await update.message.reply_text("📭 You have no upcoming reminders.")
             return
         
-        response = "🔔 **Your Reminders:**\n\n"
+        parts = ["🔔 **Your Reminders:**\n\n"]
         for r in reminders:
             title = r['summary'].replace('🔔 ', '')
-            start = r['start'].get('dateTime', r['start'].get('date'))
-            dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
-            response += f"• {title}\n  📅 {dt.strftime('%B %d at %I:%M %p')}\n\n"
-        
-        await update.message.reply_text(response)
+            parts.append(f"• {title}\n  📅 {r['_display']}\n\n")
+
+        await update.message.reply_text(''.join(parts))
         
     except Exception as e:
         await update.message.reply_text(f"❌ Error getting reminders: {str(e)}")
@@ -606,7 +830,7 @@ async def delete_reminder_command(update: Update, context: ContextTypes.DEFAULT_
     keywords = user_message.split()
     
     try:
-        reminder = bot.find_reminder_by_keywords(keywords)
+        reminder = await bot.find_reminder_by_keywords(keywords)
         if not reminder:
             await update.message.reply_text(
                 f"❌ Couldn't find a reminder matching: {user_message}\n\n"
@@ -614,7 +838,7 @@ async def delete_reminder_command(update: Update, context: ContextTypes.DEFAULT_
             )
             return
         
-        bot.delete_event(reminder['id'])
+        await bot.delete_event(reminder['id'])
         title = reminder['summary'].replace('🔔 ', '')
         await update.message.reply_text(f"✅ Deleted reminder: **{title}**")
         
@@ -633,7 +857,7 @@ async def ask_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     question = ' '.join(context.args)
     
     try:
-        answer = bot.ask_question(question)
+        answer = await bot.ask_question(question)
         await update.message.reply_text(answer)
     except Exception as e:
         await update.message.reply_text(f"❌ Error: {str(e)}")
@@ -645,8 +869,50 @@ async def unknown_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "Use /help to see all available commands!"
     )
 
+# Dispatch table: one router resolves any /command with a dict probe instead
+# of PTB walking a list of CommandHandlers per update
+COMMANDS = {
+    'start': start,
+    'help': help_command,
+    'hi': hi_command,
+    'account': account_info,
+    'addevent': add_event_command,
+    'editevent': edit_event_command,
+    'deleteevent': delete_event_command,
+    'events': events_command,
+    'remindme': remind_me_command,
+    'listreminders': list_reminders_command,
+    'deletereminder': delete_reminder_command,
+    'ask': ask_command,
+}
+
+async def route_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Dispatch /commands through the COMMANDS table"""
+    parts = update.message.text.split()
+    cmd = parts[0].lstrip('/').split('@')[0].lower()
+    context.args = parts[1:]
+    handler = COMMANDS.get(cmd, unknown_command)
+    await handler(update, context)
+
+async def _token_refresh_loop():
+    """Keep the OAuth token fresh so requests never stall on a refresh"""
+    while True:
+        await asyncio.sleep(TOKEN_REFRESH_INTERVAL)
+        await asyncio.to_thread(bot.refresh_credentials_if_needed)
+
+async def _start_background_tasks(application):
+    application.create_task(_token_refresh_loop())
+
 def main():
     """Start the bot"""
+    # uvloop's libuv-based event loop roughly halves asyncio overhead; it is
+    # Linux/macOS only, so fall back to the stock loop where unavailable
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     if not os.path.exists('.env'):
         print("❌ Error: .env file not found!")
         print("Please create a .env file with:")
@@ -672,31 +938,22 @@ def main():
         return
     
     # Create application
-    application = Application.builder().token(token).build()
-    
-    # Add command handlers
-    application.add_handler(CommandHandler("start", start))
-    application.add_handler(CommandHandler("help", help_command))
-    application.add_handler(CommandHandler("hi", hi_command))
-    application.add_handler(CommandHandler("account", account_info))
-    
-    # Event commands
-    application.add_handler(CommandHandler("addevent", add_event_command))
-    application.add_handler(CommandHandler("editevent", edit_event_command))
-    application.add_handler(CommandHandler("deleteevent", delete_event_command))
-    application.add_handler(CommandHandler("events", events_command))
-    
-    # Reminder commands
-    application.add_handler(CommandHandler("remindme", remind_me_command))
-    application.add_handler(CommandHandler("listreminders", list_reminders_command))
-    application.add_handler(CommandHandler("deletereminder", delete_reminder_command))
-    
-    # Other commands
-    application.add_handler(CommandHandler("ask", ask_command))
+    application = (
+        Application.builder()
+        .token(token)
+        .concurrent_updates(True)
+        # Queue outgoing messages just under Telegram's ~30 msg/s global cap
+        # instead of hitting 429s and retrying
+        .rate_limiter(AIORateLimiter(overall_max_rate=28, overall_time_period=1))
+        .post_init(_start_background_tasks)
+        .build()
+    )
     
-    # Handle unknown
+    # One router covers every command (unknown ones included) via COMMANDS
+    application.add_handler(MessageHandler(filters.COMMAND, route_command))
+
+    # Handle plain text
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, unknown_command))
-    application.add_handler(MessageHandler(filters.COMMAND, unknown_command))
     
     # Start bot
     print("🤖 Bot is running! Press Ctrl+C to stop.")